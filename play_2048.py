@@ -1,261 +1,686 @@
-import json
+import atexit
 import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: without it the same functions run as plain
+    # Python, just without the LLVM-compiled inner loop
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+    # The search relies on intentional uint64 wraparound (the hash
+    # multiply, the SWAR popcount); jitted code wraps silently, but the
+    # plain-Python path would emit numpy overflow RuntimeWarnings
+    np.seterr(over='ignore')
+
+
+# ---------------------------------------------------------------------------
+# Packed board representation
+#
+# The 4x4 grid is stored as a single 64-bit integer: 16 nibbles holding
+# log2(tile value), 0 for an empty cell.  Cell (i, j) lives at bit
+# 4 * (4*i + j), so row i is the 16-bit slice at bit 16*i.  Moves become
+# four lookups in a precomputed 65536-entry row table instead of list
+# copying/merging, which is what expectimax spends nearly all its time on.
+#
+# The search itself lives in module-level @njit functions operating on
+# uint64 boards and numpy tables, so Numba can compile the whole
+# recursion; GameAI is a thin wrapper that packs the selenium grid once
+# per turn.  All constants inside jitted code are explicit np.uint64 to
+# keep Numba from promoting mixed int64/uint64 arithmetic to float.
+# ---------------------------------------------------------------------------
+
+# Directions are small ints inside the search; Keys strings only exist at
+# the selenium boundary
+_LEFT, _RIGHT, _UP, _DOWN = 0, 1, 2, 3
+_DIRS = (Keys.LEFT, Keys.RIGHT, Keys.UP, Keys.DOWN)
+_DIR_INDEX = {Keys.LEFT: _LEFT, Keys.RIGHT: _RIGHT,
+              Keys.UP: _UP, Keys.DOWN: _DOWN}
+
+_NEG_INF = float('-inf')
+_POS_INF = float('inf')
+
+# Fixed-size transposition table (2^20 slots, replace-if-deeper)
+_TT_SIZE = 1 << 20
+_TT_SHIFT = np.uint64(64 - 20)
+_HASH_MULT = np.uint64(0x9E3779B97F4A7C15)  # Fibonacci hashing multiplier
+_MAX_NODE_SALT = np.uint64(0xD6E8FEB86659FD93)  # Distinguishes node types
+
+# Entry flags: with alpha-beta cutoffs a stored score may only be a bound
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+# "Snake" position weights: a monotone path of halving weights from the
+# top-left corner.  Rewarding big tiles along it keeps the board ordered,
+# which subsumes the old per-cell monotonicity counts and corner bonus.
+_SNAKE_WEIGHTS = np.array([
+    65536.0, 32768.0, 16384.0, 8192.0,
+    512.0, 1024.0, 2048.0, 4096.0,
+    256.0, 128.0, 64.0, 32.0,
+    2.0, 4.0, 8.0, 16.0,
+])
+_EMPTY_WEIGHT = 512.0
+_SMOOTH_WEIGHT = 1.0
+
+
+def _orientation_maps():
+    """Cell-index permutations for the 8 board symmetries (4 rotations x
+    optional mirror)."""
+    grid = [[i * 4 + j for j in range(4)] for i in range(4)]
+    maps = []
+    for _ in range(4):
+        maps.append([c for row in grid for c in row])
+        maps.append([c for row in grid for c in reversed(row)])
+        # Rotate 90 degrees for the next pair
+        grid = [list(row)[::-1] for row in zip(*grid)]
+    return maps
+
+
+# The snake weights permuted into every orientation: taking the best of
+# the 8 dot products makes the evaluation symmetry-invariant (empty count
+# and smoothness already are), which is what lets transposition entries
+# be shared across symmetric boards.  It also means the AI is free to
+# build towards whichever corner the board already favours.
+_SNAKE_ORIENTS = np.empty((8, 16))
+for _o, _map in enumerate(_orientation_maps()):
+    for _k in range(16):
+        _SNAKE_ORIENTS[_o, _map[_k]] = _SNAKE_WEIGHTS[_k]
+
+# ---------------------------------------------------------------------------
+# Per-row evaluation tables, built with vectorized numpy over all 65536
+# possible 16-bit rows.  Every evaluation term is a sum of per-row (or
+# per-column, i.e. per-transposed-row) contributions, so scoring a board
+# collapses to eight table lookups.
+# ---------------------------------------------------------------------------
+
+_ROW_NIBBLES = (np.arange(65536)[:, None] >> (4 * np.arange(4))) & 0xF
+_ROW_VALUES = np.where(_ROW_NIBBLES != 0,
+                       1 << _ROW_NIBBLES, 0).astype(np.float64)
+
+# Weighted empty count and horizontal smoothness per row (the vertical
+# pairs come from looking the transposed rows up in the same table)
+_EMPTY_TABLE = _EMPTY_WEIGHT * (_ROW_NIBBLES == 0).sum(axis=1).astype(np.float64)
+_SMOOTH_TABLE = -_SMOOTH_WEIGHT * np.abs(np.diff(_ROW_VALUES, axis=1)).sum(axis=1)
+
+# Snake dot products: under the 8 orientations a board row only ever
+# meets a row or column of the weight matrix, forwards or backwards, so
+# 16 row tables cover all 32 (orientation, row) combinations
+_SNAKE_ROW_WEIGHTS = np.vstack([
+    _SNAKE_WEIGHTS.reshape(4, 4),
+    _SNAKE_WEIGHTS.reshape(4, 4)[:, ::-1],
+    _SNAKE_WEIGHTS.reshape(4, 4).T,
+    _SNAKE_WEIGHTS.reshape(4, 4).T[:, ::-1],
+])
+_ROW_DOT = _ROW_VALUES @ _SNAKE_ROW_WEIGHTS.T  # (65536, 16)
+
+# Which weight row scores board row i under orientation o
+_ORIENT_ROW = np.empty((8, 4), dtype=np.int64)
+for _o in range(8):
+    for _i in range(4):
+        for _w in range(len(_SNAKE_ROW_WEIGHTS)):
+            if np.array_equal(_SNAKE_ORIENTS[_o, _i * 4:_i * 4 + 4],
+                              _SNAKE_ROW_WEIGHTS[_w]):
+                _ORIENT_ROW[_o, _i] = _w
+                break
+        else:
+            raise AssertionError('orientation %d row %d has no weight row'
+                                 % (_o, _i))
+
+# Bounds on _evaluate's output, needed for star1 pruning at chance
+# nodes: the snake dot product tops out below sum(weights) * 32768 and
+# smoothness bottoms out at -24 pairs * 32768 max tile
+_EVAL_MIN = -1000000.0
+_EVAL_MAX = 4.5e9
+
+
+def _reverse_row(row):
+    """Reverse the 4 nibbles of a 16-bit row."""
+    return ((row >> 12) | ((row >> 4) & 0x00F0) |
+            ((row << 4) & 0x0F00) | ((row << 12) & 0xF000))
+
+
+def _merge_row_left(row):
+    """Merge one 16-bit row to the left, returning the resulting row.
+
+    Works on tile exponents (nibbles); two equal tiles merge into one
+    tile with exponent + 1, capped at 15 so the nibble cannot overflow.
+    Only used at import time to build the move tables.
+    """
+    out = [0, 0, 0, 0]
+    write = 0
+    prev = 0  # Last written tile, or 0 once it may not merge again
+    for j in range(4):
+        tile = (row >> (4 * j)) & 0xF
+        if tile == 0:
+            continue
+        if tile == prev:
+            out[write - 1] = min(tile + 1, 15)
+            prev = 0  # A merged tile cannot merge again this move
+        else:
+            out[write] = tile
+            prev = tile
+            write += 1
+    return out[0] | (out[1] << 4) | (out[2] << 8) | (out[3] << 12)
+
+
+# Precomputed move tables: one entry per possible 16-bit row.  uint64 so
+# jitted lookups need no widening casts.
+ROW_LEFT = np.array([_merge_row_left(r) for r in range(65536)],
+                    dtype=np.uint64)
+ROW_RIGHT = np.array([_reverse_row(int(ROW_LEFT[_reverse_row(r)]))
+                      for r in range(65536)], dtype=np.uint64)
+
+
+@njit(cache=True)
+def _transpose(board):
+    """Transpose the packed board with the classic nibble bit-swap."""
+    a1 = board & np.uint64(0xF0F00F0FF0F00F0F)
+    a2 = board & np.uint64(0x0000F0F00000F0F0)
+    a3 = board & np.uint64(0x0F0F00000F0F0000)
+    a = a1 | (a2 << np.uint64(12)) | (a3 >> np.uint64(12))
+    b1 = a & np.uint64(0xFF00FF0000FF00FF)
+    b2 = a & np.uint64(0x00FF00FF00000000)
+    b3 = a & np.uint64(0x00000000FF00FF00)
+    return b1 | (b2 >> np.uint64(24)) | (b3 << np.uint64(24))
+
+
+@njit(cache=True)
+def _popcount(board):
+    """SWAR population count (Numba has no int.bit_count())."""
+    x = board - ((board >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = ((x & np.uint64(0x3333333333333333)) +
+         ((x >> np.uint64(2)) & np.uint64(0x3333333333333333)))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return np.int64((x * np.uint64(0x0101010101010101)) >> np.uint64(56))
+
+
+@njit(cache=True)
+def _mirror(board):
+    """Mirror the packed board horizontally (reverse each row)."""
+    return (((board >> np.uint64(12)) & np.uint64(0x000F000F000F000F)) |
+            ((board >> np.uint64(4)) & np.uint64(0x00F000F000F000F0)) |
+            ((board << np.uint64(4)) & np.uint64(0x0F000F000F000F00)) |
+            ((board << np.uint64(12)) & np.uint64(0xF000F000F000F000)))
+
+
+@njit(cache=True)
+def _canonical(board):
+    """Smallest of the board's 8 symmetries.
+
+    Used only for transposition-table keys, so entries are shared across
+    rotated/mirrored transpositions; the search itself always works on
+    the true board.  Sound because _evaluate is symmetry-invariant.
+    """
+    best = board
+    b = board
+    for _ in range(3):
+        b = _mirror(_transpose(b))  # Rotate 90 degrees
+        if b < best:
+            best = b
+    b = _mirror(board)
+    if b < best:
+        best = b
+    for _ in range(3):
+        b = _mirror(_transpose(b))
+        if b < best:
+            best = b
+    return best
+
+
+@njit(cache=True)
+def _simulate_move(board, direction):
+    """Apply a move to a packed board, returning the resulting board."""
+    if direction >= _UP:
+        # Columns become rows on the transposed board
+        board = _transpose(board)
+    if direction == _RIGHT or direction == _DOWN:
+        table = ROW_RIGHT
+    else:
+        table = ROW_LEFT
+    mask = np.uint64(0xFFFF)
+    result = (table[board & mask] |
+              (table[(board >> np.uint64(16)) & mask] << np.uint64(16)) |
+              (table[(board >> np.uint64(32)) & mask] << np.uint64(32)) |
+              (table[(board >> np.uint64(48)) & mask] << np.uint64(48)))
+    if direction >= _UP:
+        result = _transpose(result)
+    return result
+
+
+# No cache=True here: Numba refuses to cache functions that close over
+# large global arrays like _ROW_DOT and warns on every run
+@njit
+def _evaluate(board):
+    """Heuristic evaluation of a packed board.
+
+    Eight table lookups: the four rows cover empties, horizontal
+    smoothness and the snake dot products; the four transposed rows
+    cover vertical smoothness.
+    """
+    mask = np.uint64(0xFFFF)
+    r0 = np.int64(board & mask)
+    r1 = np.int64((board >> np.uint64(16)) & mask)
+    r2 = np.int64((board >> np.uint64(32)) & mask)
+    r3 = np.int64((board >> np.uint64(48)) & mask)
+    t = _transpose(board)
+    t0 = np.int64(t & mask)
+    t1 = np.int64((t >> np.uint64(16)) & mask)
+    t2 = np.int64((t >> np.uint64(32)) & mask)
+    t3 = np.int64((t >> np.uint64(48)) & mask)
+
+    score = (_EMPTY_TABLE[r0] + _EMPTY_TABLE[r1] +
+             _EMPTY_TABLE[r2] + _EMPTY_TABLE[r3] +
+             _SMOOTH_TABLE[r0] + _SMOOTH_TABLE[r1] +
+             _SMOOTH_TABLE[r2] + _SMOOTH_TABLE[r3] +
+             _SMOOTH_TABLE[t0] + _SMOOTH_TABLE[t1] +
+             _SMOOTH_TABLE[t2] + _SMOOTH_TABLE[t3])
+
+    # Best snake orientation from the precomputed per-row dot products
+    snake = -np.inf
+    for o in range(8):
+        s = (_ROW_DOT[r0, _ORIENT_ROW[o, 0]] +
+             _ROW_DOT[r1, _ORIENT_ROW[o, 1]] +
+             _ROW_DOT[r2, _ORIENT_ROW[o, 2]] +
+             _ROW_DOT[r3, _ORIENT_ROW[o, 3]])
+        if s > snake:
+            snake = s
+
+    # Clamp to the star1 pruning bounds
+    return min(max(score + snake, _EVAL_MIN), _EVAL_MAX)
+
+
+@njit
+def _expectimax(board, depth, is_max, alpha, beta,
+                tt_keys, tt_depths, tt_scores, tt_flags):
+    """Expectimax with alpha-beta at max nodes and star1 at chance nodes.
+
+    The transposition table is four parallel arrays passed in by the
+    caller (Numba treats module globals as read-only): full key, depth,
+    score and exact/lower/upper flag per slot, replace-if-deeper.
+    """
+    if depth == 0:
+        return _evaluate(board)
+
+    # Transposition-table lookup: identical boards are reached through
+    # many move/spawn orderings; reuse any result searched at least
+    # this deep, respecting whether the score was exact or a bound.
+    # Keys are canonicalized so all 8 symmetries of a board share one
+    # entry (their search values are equal: _evaluate is invariant).
+    canon = _canonical(board)
+    key = canon ^ _MAX_NODE_SALT if is_max else canon
+    slot = np.int64((key * _HASH_MULT) >> _TT_SHIFT)
+    if tt_keys[slot] == key and tt_depths[slot] >= depth:
+        e_score = tt_scores[slot]
+        e_flag = tt_flags[slot]
+        if (e_flag == _EXACT or
+                (e_flag == _LOWER and e_score >= beta) or
+                (e_flag == _UPPER and e_score <= alpha)):
+            return e_score
+
+    alpha0 = alpha
+    beta0 = beta
+
+    if is_max:  # Player's move
+        # Order moves by shallow evaluation so the likely-best move
+        # raises alpha first and cuts the rest
+        boards = np.empty(4, np.uint64)
+        scores = np.empty(4, np.float64)
+        n = 0
+        for direction in range(4):
+            new_board = _simulate_move(board, direction)
+            if new_board == board:
+                continue  # Skip invalid moves
+            boards[n] = new_board
+            scores[n] = _evaluate(new_board)
+            n += 1
+
+        if n == 0:
+            result = _evaluate(board)
+        elif depth == 1:
+            # The children are depth-0 leaves, so their value is exactly
+            # the shallow evaluation already computed for move ordering
+            best_score = scores[0]
+            for k in range(1, n):
+                if scores[k] > best_score:
+                    best_score = scores[k]
+            result = best_score
+        else:
+            for k in range(1, n):  # Insertion sort, descending
+                s, b = scores[k], boards[k]
+                m = k - 1
+                while m >= 0 and scores[m] < s:
+                    scores[m + 1] = scores[m]
+                    boards[m + 1] = boards[m]
+                    m -= 1
+                scores[m + 1] = s
+                boards[m + 1] = b
+
+            best_score = -np.inf
+            for k in range(n):
+                score = _expectimax(boards[k], depth - 1, False, alpha, beta,
+                                    tt_keys, tt_depths, tt_scores, tt_flags)
+                if score > best_score:
+                    best_score = score
+                if best_score > alpha:
+                    alpha = best_score
+                if alpha >= beta:
+                    break  # Remaining moves cannot matter
+            result = best_score
+
+    else:  # Random tile placement (chance node), star1 pruning
+        # OR the nibble bits down so each nibble's low bit says whether
+        # the cell is occupied; one popcount then counts the empties
+        occupied = ((board | (board >> np.uint64(1)) |
+                     (board >> np.uint64(2)) | (board >> np.uint64(3))) &
+                    np.uint64(0x1111111111111111))
+        empty_count = 16 - _popcount(occupied)
+
+        if empty_count == 0:
+            result = _evaluate(board)
+        else:
+            # Each (cell, tile) spawn is a weighted child; once the
+            # optimistic (pessimistic) completion of the running sum can
+            # no longer exceed alpha (stay below beta), return the bound
+            total = 0.0
+            remaining = 1.0
+            pruned = False
+            for pos in range(16):
+                shift = np.uint64(4 * pos)
+                if (occupied >> shift) & np.uint64(1):
+                    continue
+                # Each empty cell spawns a 2 with 90% and a 4 with 10%.
+                # At the deepest ply the 10% branch is skipped and the 2
+                # carries the cell's full weight: a tiny bias for nearly
+                # half the chance-node work
+                for nibble in range(1, 3):
+                    if depth <= 1:
+                        if nibble == 2:
+                            continue
+                        prob = 1.0
+                    else:
+                        prob = 0.9 if nibble == 1 else 0.1
+                    weight = prob / empty_count
+                    # Derive the child's window from what it could still
+                    # contribute to the parent's expectation
+                    rest = remaining - weight
+                    child_alpha = (alpha - total - rest * _EVAL_MAX) / weight
+                    child_beta = (beta - total - rest * _EVAL_MIN) / weight
+                    score = _expectimax(
+                        board | (np.uint64(nibble) << shift), depth - 1, True,
+                        max(child_alpha, _EVAL_MIN), min(child_beta, _EVAL_MAX),
+                        tt_keys, tt_depths, tt_scores, tt_flags)
+                    total += weight * score
+                    remaining = rest
+                    if total + remaining * _EVAL_MAX <= alpha:
+                        result = total + remaining * _EVAL_MAX
+                        pruned = True  # Cannot beat alpha
+                        break
+                    if total + remaining * _EVAL_MIN >= beta:
+                        result = total + remaining * _EVAL_MIN
+                        pruned = True  # Cannot stay under beta
+                        break
+                if pruned:
+                    break
+            if not pruned:
+                result = total
+
+    # Classify the result against the original window before storing;
+    # store with a replace-if-deeper policy so shallow passes never
+    # evict deeper results
+    if result <= alpha0:
+        flag = _UPPER
+    elif result >= beta0:
+        flag = _LOWER
+    else:
+        flag = _EXACT
+    if tt_depths[slot] < depth:
+        tt_keys[slot] = key
+        tt_depths[slot] = depth
+        tt_scores[slot] = result
+        tt_flags[slot] = flag
+    return result
+
+
+# Prefer the compiled Cython search when it has been built (setup.py /
+# search.pyx): a straight C port of the jitted functions above, handed
+# the same tables, with no JIT warm-up and no compile on first call
+try:
+    import search as _csearch
+except ImportError:
+    _csearch = None
+if _csearch is not None:
+    _csearch.init_tables(ROW_LEFT, ROW_RIGHT, _EMPTY_TABLE, _SMOOTH_TABLE,
+                         _ROW_DOT, _ORIENT_ROW, _EVAL_MIN, _EVAL_MAX)
+    _simulate_move = _csearch.simulate_move
+    _evaluate = _csearch.evaluate
+    _expectimax = _csearch.expectimax
+
+
+# The four root subtrees are independent, so they are searched in
+# parallel worker processes; only packed boards and small scalars cross
+# the process boundary.  The pool is created on first use (never at
+# import, which the workers themselves re-run) and each worker keeps one
+# process-private transposition table that survives across turns.
+_POOL = None
+_WORKER_TT = None
+
+
+def _root_pool():
+    global _POOL
+    if _POOL is None:
+        _POOL = ProcessPoolExecutor(max_workers=4)
+        # Shut down explicitly so interpreter exit stays quiet
+        atexit.register(_POOL.shutdown)
+    return _POOL
+
+
+def _search_worker(board, max_depth, budget):
+    """Search one root child in a worker process.
+
+    Runs its own iterative deepening against the process-private
+    transposition table, so shallower passes warm the table for deeper
+    ones and the deadline still bounds the work per move.
+    """
+    global _WORKER_TT
+    if _WORKER_TT is None:
+        _WORKER_TT = (np.zeros(_TT_SIZE, dtype=np.uint64),
+                      np.full(_TT_SIZE, -1, dtype=np.int8),
+                      np.zeros(_TT_SIZE, dtype=np.float64),
+                      np.zeros(_TT_SIZE, dtype=np.uint8))
+    tt_keys, tt_depths, tt_scores, tt_flags = _WORKER_TT
+    deadline = time.monotonic() + budget
+    score = _expectimax(np.uint64(board), 1, False, _NEG_INF, _POS_INF,
+                        tt_keys, tt_depths, tt_scores, tt_flags)
+    # The deadline is checked between passes only, so the returned score
+    # is always the result of a completed pass
+    for depth in range(2, max_depth + 1):
+        if time.monotonic() >= deadline:
+            break
+        score = _expectimax(np.uint64(board), depth, False, _NEG_INF, _POS_INF,
+                            tt_keys, tt_depths, tt_scores, tt_flags)
+    return float(score)
+
+
+def _from_grid(grid):
+    """Pack a 4x4 list-of-lists of tile values into a 64-bit board."""
+    board = 0
+    shift = 0
+    for row in grid:
+        for val in row:
+            if val:
+                board |= (val.bit_length() - 1) << shift
+            shift += 4
+    return board
+
+
+def _to_grid(board):
+    """Unpack a 64-bit board back to a 4x4 list-of-lists of tile values.
+
+    Only needed at the selenium interface layer.
+    """
+    board = int(board)
+    grid = []
+    for i in range(4):
+        row = []
+        for j in range(4):
+            nibble = (board >> (4 * (4 * i + j))) & 0xF
+            row.append((1 << nibble) if nibble else 0)
+        grid.append(row)
+    return grid
 
 
 class GameAI:
+    __slots__ = ('driver', 'prev_score', 'max_depth', 'move_deadline',
+                 '_state_cache', '_tt_keys', '_tt_depths', '_tt_scores',
+                 '_tt_flags')
+
     def __init__(self, driver):
         self.driver = driver
         self.prev_score = 0
         self.max_depth = 3  # Search depth for expectimax
-        
+        self.move_deadline = 0.1  # Seconds of search budget per move
+        self._state_cache = None  # [score, grid], valid until the next move
+        # Per-instance transposition table, shaped for the jitted search
+        self._tt_keys = np.zeros(_TT_SIZE, dtype=np.uint64)
+        self._tt_depths = np.full(_TT_SIZE, -1, dtype=np.int8)
+        self._tt_scores = np.zeros(_TT_SIZE, dtype=np.float64)
+        self._tt_flags = np.zeros(_TT_SIZE, dtype=np.uint8)
+
     def get_game_state(self):
-        """Retrieve game state from local storage"""
-        state_json = self.driver.execute_script(
-            "return localStorage.getItem('2048GameState_hardcore');"
-        )
-        return json.loads(state_json)
-    
+        """Retrieve [score, grid] from local storage in one round-trip.
+
+        The pair is parsed browser-side and cached until the next move, so
+        a turn costs a single WebDriver round-trip however often the score
+        or grid is read.
+        """
+        if self._state_cache is None:
+            self._state_cache = self.driver.execute_script(
+                "var s = JSON.parse("
+                "localStorage.getItem('2048GameState_hardcore'));"
+                "return [s.score, s.grid];"
+            )
+        return self._state_cache
+
     def make_move(self, direction):
         """Send move to the game"""
         body = self.driver.find_element(By.TAG_NAME, 'body')
+        prev_state = self._state_cache  # State the move was decided on
         body.send_keys(direction)
-        time.sleep(0.1)  # Allow animation to complete
-        
+        self._state_cache = None  # The stored state is stale now
+        self._wait_for_move(prev_state)
+
+    def _wait_for_move(self, prev_state):
+        """Block until the stored game state reflects the sent move.
+
+        Polls every 20 ms for the [score, grid] pair to change from the
+        pre-move state, so the wait returns as soon as the game has
+        committed the move instead of sleeping a fixed interval.  Watching
+        localStorage rather than the .tile-new/.tile-merged classes also
+        works on sites that keep those classes on tiles until the next
+        move.  The 1 s timeout keeps a missed signal from hanging the
+        loop.
+        """
+        if prev_state is None:
+            return  # Nothing to compare against; state was never read
+        try:
+            WebDriverWait(self.driver, 1, poll_frequency=0.02).until(
+                lambda d: d.execute_script(
+                    "var s = JSON.parse("
+                    "localStorage.getItem('2048GameState_hardcore'));"
+                    "return [s.score, s.grid];"
+                ) != prev_state)
+        except TimeoutException:
+            pass  # Missed the signal; the state read is still safe
+
     def get_grid(self):
         """Get current 4x4 grid from game state"""
-        state = self.get_game_state()
-        grid_1d = state['grid']
+        grid_1d = self.get_game_state()[1]
         return [grid_1d[i:i+4] for i in range(0, 16, 4)]
-    
+
+    def get_board(self):
+        """Get current game state as a packed 64-bit board"""
+        return _from_grid(self.get_grid())
+
     def get_score(self):
         """Get current score from game state"""
-        return self.get_game_state()['score']
-    
-    def get_possible_moves(self, grid):
-        """Get all valid moves for current grid"""
-        moves = []
-        for direction in [Keys.LEFT, Keys.RIGHT, Keys.UP, Keys.DOWN]:
-            if self.simulate_move(grid, direction) != grid:
-                moves.append(direction)
-        return moves
-    
-    def simulate_move(self, grid, direction):
+        return self.get_game_state()[0]
+
+    def simulate_move(self, board, direction):
         """Simulate a move without modifying actual game state"""
-        # Create a deep copy of the grid
-        rows = [row[:] for row in grid]
-        
-        if direction in (Keys.LEFT, Keys.RIGHT):
-            for i in range(4):
-                # Extract non-zero tiles
-                non_zero = [x for x in rows[i] if x != 0]
-                if not non_zero:
-                    continue
-                    
-                # For RIGHT: process tiles from right to left
-                if direction == Keys.RIGHT:
-                    non_zero.reverse()
-                    
-                # Merge adjacent tiles
-                j = 0
-                while j < len(non_zero) - 1:
-                    if non_zero[j] == non_zero[j+1]:
-                        non_zero[j] *= 2
-                        non_zero.pop(j+1)
-                    j += 1
-                    
-                # Reverse back if needed
-                if direction == Keys.RIGHT:
-                    non_zero.reverse()
-                    
-                # Pad with zeros in correct positions
-                if direction == Keys.LEFT:
-                    rows[i] = non_zero + [0] * (4 - len(non_zero))
-                else:  # RIGHT
-                    rows[i] = [0] * (4 - len(non_zero)) + non_zero
-    
-        elif direction in (Keys.UP, Keys.DOWN):
-            for j in range(4):
-                # Extract non-zero tiles from column
-                col = [rows[i][j] for i in range(4) if rows[i][j] != 0]
-                if not col:
-                    continue
-                    
-                # For DOWN: process tiles from bottom to top
-                if direction == Keys.DOWN:
-                    col.reverse()
-                    
-                # Merge adjacent tiles
-                i = 0
-                while i < len(col) - 1:
-                    if col[i] == col[i+1]:
-                        col[i] *= 2
-                        col.pop(i+1)
-                    i += 1
-                    
-                # Reverse back if needed
-                if direction == Keys.DOWN:
-                    col.reverse()
-                    
-                # Pad with zeros in correct positions
-                if direction == Keys.UP:
-                    padded_col = col + [0] * (4 - len(col))
-                else:  # DOWN
-                    padded_col = [0] * (4 - len(col)) + col
-                    
-                # Update column
-                for i in range(4):
-                    rows[i][j] = padded_col[i]
-                    
-        return rows
-
-    def is_move_valid(self, grid, direction):
-        new_grid = self.simulate_move(grid, direction)
-        return any(new_grid[i][j] != grid[i][j] 
-                  for i in range(4) for j in range(4))
-    
-    def evaluate_grid(self, grid):
-        """Heuristic evaluation of grid state"""
-        # Weighting parameters
-        weights = {
-            'empty': 10.0,
-            'monotonicity': 1.0,
-            'smoothness': 0.1,
-            'max_position': 100.0
-        }
-        
-        # Count empty tiles
-        empty = sum(row.count(0) for row in grid)
-        
-        # Find max tile and its position
-        max_val = 0
-        max_pos = (-1, -1)
-        for i in range(4):
-            for j in range(4):
-                if grid[i][j] > max_val:
-                    max_val = grid[i][j]
-                    max_pos = (i, j)
-        
-        # Bonus for max tile in corner
-        max_bonus = 1 if max_pos in [(0, 0), (0, 3), (3, 0), (3, 3)] else 0
-        
-        # Calculate monotonicity
-        mono = 0
-        for i in range(4):
-            for j in range(3):
-                if grid[i][j] >= grid[i][j+1]:
-                    mono += 1
-            for j in range(1, 4):
-                if grid[i][j] >= grid[i][j-1]:
-                    mono += 1
-                    
-        # Calculate smoothness (minimize adjacent differences)
-        smooth = 0
-        for i in range(4):
-            for j in range(4):
-                if j < 3:
-                    smooth -= abs(grid[i][j] - grid[i][j+1])
-                if i < 3:
-                    smooth -= abs(grid[i][j] - grid[i+1][j])
-        
-        # Weighted sum of factors
-        return (
-            weights['empty'] * empty +
-            weights['monotonicity'] * mono +
-            weights['smoothness'] * smooth +
-            weights['max_position'] * max_bonus
-        )
-    
-    def expectimax_search(self, grid, depth, move=False):
-        """Expectimax algorithm with configurable depth"""
-        if depth == 0:
-            return self.evaluate_grid(grid)
-        
-        if move:  # Player's move
-            best_score = float('-inf')
-            for direction in [Keys.LEFT, Keys.RIGHT, Keys.UP, Keys.DOWN]:
-                new_grid = self.simulate_move(grid, direction)
-                if new_grid == grid:
-                    continue  # Skip invalid moves
-                score = self.expectimax_search(new_grid, depth-1, False)
-                if score > best_score:
-                    best_score = score
-            return best_score if best_score != float('-inf') else self.evaluate_grid(grid)
-        
-        else:  # Random tile placement (chance node)
-            empty_cells = []
-            for i in range(4):
-                for j in range(4):
-                    if grid[i][j] == 0:
-                        empty_cells.append((i, j))
-            
-            if not empty_cells:
-                return self.evaluate_grid(grid)
-                
-            total_score = 0
-            # For each empty cell, consider both 2 and 4 possibilities
-            for (i, j) in empty_cells:
-                # Try 2 (90% probability)
-                grid[i][j] = 2
-                total_score += 0.9 * self.expectimax_search(grid, depth-1, True)
-                
-                # Try 4 (10% probability)
-                grid[i][j] = 4
-                total_score += 0.1 * self.expectimax_search(grid, depth-1, True)
-                
-                # Reset cell
-                grid[i][j] = 0
-                
-            return total_score / len(empty_cells)
-    
-    def get_best_move(self):
-        """Determine best move using expectimax algorithm"""
-        grid = self.get_grid()
-        best_score = float('-inf')
-        best_move = None
-        
-        for direction in [Keys.LEFT, Keys.RIGHT, Keys.UP, Keys.DOWN]:
-            new_grid = self.simulate_move(grid, direction)
-            if new_grid == grid:
-                continue  # Skip invalid moves
-                
-            # Evaluate move
-            move_score = self.expectimax_search(new_grid, self.max_depth, False)
-            if move_score > best_score:
-                best_score = move_score
-                best_move = direction
-                
-        return best_move if best_move is not None else Keys.LEFT  # Default if no valid moves
+        return int(_simulate_move(np.uint64(board), _DIR_INDEX[direction]))
+
+    def evaluate_grid(self, board):
+        """Heuristic evaluation of board state"""
+        return _evaluate(np.uint64(board))
+
+    def expectimax_search(self, board, depth, move=False,
+                          alpha=_NEG_INF, beta=_POS_INF):
+        """Expectimax with alpha-beta at max nodes and star1 at chance nodes"""
+        return _expectimax(np.uint64(board), depth, move, alpha, beta,
+                           self._tt_keys, self._tt_depths,
+                           self._tt_scores, self._tt_flags)
+
+    def get_best_move(self, board):
+        """Determine best move using iteratively deepened expectimax.
+
+        Returns None when no direction changes the board (game over).
+        The root subtrees share no state, so each legal move is searched
+        in its own worker process and the best score wins.
+        """
+        # The root children never change across deepening passes, so
+        # simulate each direction once up front; a move is legal iff its
+        # child differs from the board, a single integer compare
+        children = []
+        for direction in _DIRS:
+            new_board = self.simulate_move(board, direction)
+            if new_board != board:
+                children.append((direction, new_board))
+        if not children:
+            return None
+        if len(children) == 1:
+            return children[0][0]  # Forced move, skip the search
+
+        pool = _root_pool()
+        futures = [pool.submit(_search_worker, new_board, self.max_depth,
+                               self.move_deadline)
+                   for _, new_board in children]
+        scores = [future.result() for future in futures]
+        return children[scores.index(max(scores))][0]
 
     def play_game(self):
-    
+
         while True:
-            time.sleep(0.15)
-            grid = self.get_grid()
-            possible_moves = [d for d in [Keys.UP, Keys.DOWN, Keys.LEFT, Keys.RIGHT] 
-                             if self.is_move_valid(grid, d)]
-        
-            if not possible_moves:
-                print(grid)
+            # One localStorage round-trip per turn; everything downstream
+            # works on the packed board
+            board = self.get_board()
+            best_move = self.get_best_move(board)
+
+            if best_move is None:  # No direction changes the board
+                print(_to_grid(board))
                 time.sleep(40)
                 print("Game Over!")
                 break
-            
-            best_move = self.get_best_move()
-            self.make_move(best_move)
 
-# Initialize and run the AI
-driver = webdriver.Chrome()
-driver.get("http://wildcryptokid.com/2048/game/hardcore")
-
-try:
-    ai = GameAI(driver)
-    ai.play_game()
-finally:
-    driver.quit()
+            self.make_move(best_move)
 
+# Initialize and run the AI (guarded so the worker processes importing
+# this module do not each launch a browser)
+if __name__ == "__main__":
+    driver = webdriver.Chrome()
+    driver.get("http://wildcryptokid.com/2048/game/hardcore")
 
+    try:
+        ai = GameAI(driver)
+        ai.play_game()
+    finally:
+        driver.quit()
@@ -0,0 +1,332 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+# cython: language_level=3
+"""Cython build of the expectimax search.
+
+A straight port of the jitted functions in play_2048, compiled to a C
+extension for maximum throughput and no JIT warm-up.  play_2048 hands
+the precomputed move/evaluation tables to init_tables() once at import
+and prefers these entry points when the extension is available; without
+it the Numba/pure-Python path is used instead.
+
+Compile in place with:
+
+    python setup.py build_ext --inplace
+"""
+
+from libc.stdint cimport uint64_t, int64_t, int8_t, uint8_t
+
+cdef extern from *:
+    int __builtin_popcountll(unsigned long long) nogil
+
+import numpy as np
+
+
+# Directions, matching play_2048
+cdef enum:
+    LEFT = 0
+    RIGHT = 1
+    UP = 2
+    DOWN = 3
+
+# Entry flags, matching play_2048: a stored score may only be a bound
+cdef enum:
+    EXACT = 0
+    LOWER = 1
+    UPPER = 2
+
+cdef uint64_t MAX_NODE_SALT = 0xD6E8FEB86659FD93ULL
+cdef uint64_t HASH_MULT = 0x9E3779B97F4A7C15ULL
+cdef uint64_t TT_SHIFT = 44  # 64 - log2(table size)
+
+# Tables handed over by play_2048; memoryviews keep the numpy arrays alive
+cdef uint64_t[::1] _row_left
+cdef uint64_t[::1] _row_right
+cdef double[::1] _empty_table
+cdef double[::1] _smooth_table
+cdef double[:, ::1] _row_dot
+cdef int64_t[:, ::1] _orient_row
+cdef double _eval_min = 0.0
+cdef double _eval_max = 0.0
+cdef bint _initialized = False
+
+
+def init_tables(row_left, row_right, empty_table, smooth_table,
+                row_dot, orient_row, double eval_min, double eval_max):
+    """Adopt the move and evaluation tables built by play_2048."""
+    global _row_left, _row_right, _empty_table, _smooth_table
+    global _row_dot, _orient_row, _eval_min, _eval_max, _initialized
+    _row_left = np.ascontiguousarray(row_left, dtype=np.uint64)
+    _row_right = np.ascontiguousarray(row_right, dtype=np.uint64)
+    _empty_table = np.ascontiguousarray(empty_table, dtype=np.float64)
+    _smooth_table = np.ascontiguousarray(smooth_table, dtype=np.float64)
+    _row_dot = np.ascontiguousarray(row_dot, dtype=np.float64)
+    _orient_row = np.ascontiguousarray(orient_row, dtype=np.int64)
+    _eval_min = eval_min
+    _eval_max = eval_max
+    _initialized = True
+
+
+cdef inline uint64_t c_transpose(uint64_t board):
+    """Transpose the packed board with the classic nibble bit-swap."""
+    cdef uint64_t a1 = board & 0xF0F00F0FF0F00F0FULL
+    cdef uint64_t a2 = board & 0x0000F0F00000F0F0ULL
+    cdef uint64_t a3 = board & 0x0F0F00000F0F0000ULL
+    cdef uint64_t a = a1 | (a2 << 12) | (a3 >> 12)
+    cdef uint64_t b1 = a & 0xFF00FF0000FF00FFULL
+    cdef uint64_t b2 = a & 0x00FF00FF00000000ULL
+    cdef uint64_t b3 = a & 0x00000000FF00FF00ULL
+    return b1 | (b2 >> 24) | (b3 << 24)
+
+
+cdef inline uint64_t c_mirror(uint64_t board):
+    """Mirror the packed board horizontally (reverse each row)."""
+    return (((board >> 12) & 0x000F000F000F000FULL) |
+            ((board >> 4) & 0x00F000F000F000F0ULL) |
+            ((board << 4) & 0x0F000F000F000F00ULL) |
+            ((board << 12) & 0xF000F000F000F000ULL))
+
+
+cdef uint64_t c_canonical(uint64_t board):
+    """Smallest of the board's 8 symmetries; transposition keys only."""
+    cdef uint64_t best = board
+    cdef uint64_t b = board
+    cdef int k
+    for k in range(3):
+        b = c_mirror(c_transpose(b))  # Rotate 90 degrees
+        if b < best:
+            best = b
+    b = c_mirror(board)
+    if b < best:
+        best = b
+    for k in range(3):
+        b = c_mirror(c_transpose(b))
+        if b < best:
+            best = b
+    return best
+
+
+cdef uint64_t c_simulate_move(uint64_t board, int direction):
+    """Apply a move to a packed board, returning the resulting board."""
+    cdef uint64_t[::1] table
+    cdef uint64_t result
+    if direction >= UP:
+        # Columns become rows on the transposed board
+        board = c_transpose(board)
+    if direction == RIGHT or direction == DOWN:
+        table = _row_right
+    else:
+        table = _row_left
+    result = (table[board & 0xFFFF] |
+              (table[(board >> 16) & 0xFFFF] << 16) |
+              (table[(board >> 32) & 0xFFFF] << 32) |
+              (table[(board >> 48) & 0xFFFF] << 48))
+    if direction >= UP:
+        result = c_transpose(result)
+    return result
+
+
+cdef double c_evaluate(uint64_t board):
+    """Heuristic evaluation of a packed board; eight table lookups."""
+    cdef int64_t r0 = <int64_t>(board & 0xFFFF)
+    cdef int64_t r1 = <int64_t>((board >> 16) & 0xFFFF)
+    cdef int64_t r2 = <int64_t>((board >> 32) & 0xFFFF)
+    cdef int64_t r3 = <int64_t>((board >> 48) & 0xFFFF)
+    cdef uint64_t t = c_transpose(board)
+    cdef int64_t t0 = <int64_t>(t & 0xFFFF)
+    cdef int64_t t1 = <int64_t>((t >> 16) & 0xFFFF)
+    cdef int64_t t2 = <int64_t>((t >> 32) & 0xFFFF)
+    cdef int64_t t3 = <int64_t>((t >> 48) & 0xFFFF)
+
+    cdef double score = (_empty_table[r0] + _empty_table[r1] +
+                         _empty_table[r2] + _empty_table[r3] +
+                         _smooth_table[r0] + _smooth_table[r1] +
+                         _smooth_table[r2] + _smooth_table[r3] +
+                         _smooth_table[t0] + _smooth_table[t1] +
+                         _smooth_table[t2] + _smooth_table[t3])
+
+    # Best snake orientation from the precomputed per-row dot products
+    cdef double snake = -1e308
+    cdef double s
+    cdef int o
+    for o in range(8):
+        s = (_row_dot[r0, _orient_row[o, 0]] +
+             _row_dot[r1, _orient_row[o, 1]] +
+             _row_dot[r2, _orient_row[o, 2]] +
+             _row_dot[r3, _orient_row[o, 3]])
+        if s > snake:
+            snake = s
+
+    # Clamp to the star1 pruning bounds
+    return min(max(score + snake, _eval_min), _eval_max)
+
+
+cdef double c_expectimax(uint64_t board, int depth, bint is_max,
+                         double alpha, double beta,
+                         uint64_t[::1] tt_keys, int8_t[::1] tt_depths,
+                         double[::1] tt_scores, uint8_t[::1] tt_flags):
+    """Expectimax with alpha-beta at max nodes and star1 at chance nodes."""
+    if depth == 0:
+        return c_evaluate(board)
+
+    # Transposition-table lookup on the canonical (symmetry-smallest) key
+    cdef uint64_t canon = c_canonical(board)
+    cdef uint64_t key = canon ^ MAX_NODE_SALT if is_max else canon
+    cdef int64_t slot = <int64_t>((key * HASH_MULT) >> TT_SHIFT)
+    cdef double e_score
+    cdef int e_flag
+    if tt_keys[slot] == key and tt_depths[slot] >= depth:
+        e_score = tt_scores[slot]
+        e_flag = tt_flags[slot]
+        if (e_flag == EXACT or
+                (e_flag == LOWER and e_score >= beta) or
+                (e_flag == UPPER and e_score <= alpha)):
+            return e_score
+
+    cdef double alpha0 = alpha
+    cdef double beta0 = beta
+    cdef double result, score, best_score
+    cdef uint64_t new_board
+    cdef int direction, n, k, m, pos, nibble, flag
+    cdef uint64_t boards[4]
+    cdef double scores[4]
+    cdef uint64_t bk
+    cdef double sk
+    cdef int empty_count
+    cdef uint64_t occupied, shift
+    cdef double total, remaining, prob, weight, rest
+    cdef double child_alpha, child_beta
+    cdef bint pruned
+
+    if is_max:  # Player's move
+        # Order moves by shallow evaluation so the likely-best move
+        # raises alpha first and cuts the rest
+        n = 0
+        for direction in range(4):
+            new_board = c_simulate_move(board, direction)
+            if new_board == board:
+                continue  # Skip invalid moves
+            boards[n] = new_board
+            scores[n] = c_evaluate(new_board)
+            n += 1
+
+        if n == 0:
+            result = c_evaluate(board)
+        elif depth == 1:
+            # The children are depth-0 leaves, so their value is exactly
+            # the shallow evaluation already computed for move ordering
+            best_score = scores[0]
+            for k in range(1, n):
+                if scores[k] > best_score:
+                    best_score = scores[k]
+            result = best_score
+        else:
+            for k in range(1, n):  # Insertion sort, descending
+                sk = scores[k]
+                bk = boards[k]
+                m = k - 1
+                while m >= 0 and scores[m] < sk:
+                    scores[m + 1] = scores[m]
+                    boards[m + 1] = boards[m]
+                    m -= 1
+                scores[m + 1] = sk
+                boards[m + 1] = bk
+
+            best_score = -1e308
+            for k in range(n):
+                score = c_expectimax(boards[k], depth - 1, False, alpha, beta,
+                                     tt_keys, tt_depths, tt_scores, tt_flags)
+                if score > best_score:
+                    best_score = score
+                if best_score > alpha:
+                    alpha = best_score
+                if alpha >= beta:
+                    break  # Remaining moves cannot matter
+            result = best_score
+
+    else:  # Random tile placement (chance node), star1 pruning
+        # OR the nibble bits down so each nibble's low bit says whether
+        # the cell is occupied; one POPCNT then counts the empties
+        occupied = ((board | (board >> 1) | (board >> 2) | (board >> 3)) &
+                    0x1111111111111111ULL)
+        empty_count = 16 - __builtin_popcountll(occupied)
+
+        if empty_count == 0:
+            result = c_evaluate(board)
+        else:
+            # Each (cell, tile) spawn is a weighted child; once the
+            # optimistic (pessimistic) completion of the running sum can
+            # no longer exceed alpha (stay below beta), return the bound
+            total = 0.0
+            remaining = 1.0
+            pruned = False
+            for pos in range(16):
+                shift = <uint64_t>(4 * pos)
+                if (occupied >> shift) & 1:
+                    continue
+                # Each empty cell spawns a 2 with 90% and a 4 with 10%.
+                # At the deepest ply the 10% branch is skipped and the 2
+                # carries the cell's full weight: a tiny bias for nearly
+                # half the chance-node work
+                for nibble in range(1, 3):
+                    if depth <= 1:
+                        if nibble == 2:
+                            continue
+                        prob = 1.0
+                    else:
+                        prob = 0.9 if nibble == 1 else 0.1
+                    weight = prob / empty_count
+                    # Derive the child's window from what it could still
+                    # contribute to the parent's expectation
+                    rest = remaining - weight
+                    child_alpha = (alpha - total - rest * _eval_max) / weight
+                    child_beta = (beta - total - rest * _eval_min) / weight
+                    score = c_expectimax(
+                        board | (<uint64_t>nibble << shift), depth - 1, True,
+                        max(child_alpha, _eval_min), min(child_beta, _eval_max),
+                        tt_keys, tt_depths, tt_scores, tt_flags)
+                    total += weight * score
+                    remaining = rest
+                    if total + remaining * _eval_max <= alpha:
+                        result = total + remaining * _eval_max
+                        pruned = True  # Cannot beat alpha
+                        break
+                    if total + remaining * _eval_min >= beta:
+                        result = total + remaining * _eval_min
+                        pruned = True  # Cannot stay under beta
+                        break
+                if pruned:
+                    break
+            if not pruned:
+                result = total
+
+    # Classify the result against the original window before storing;
+    # replace-if-deeper so shallow passes never evict deeper results
+    if result <= alpha0:
+        flag = UPPER
+    elif result >= beta0:
+        flag = LOWER
+    else:
+        flag = EXACT
+    if tt_depths[slot] < depth:
+        tt_keys[slot] = key
+        tt_depths[slot] = depth
+        tt_scores[slot] = result
+        tt_flags[slot] = flag
+    return result
+
+
+def simulate_move(board, direction):
+    """Apply a move to a packed board, returning the resulting board."""
+    return c_simulate_move(board, direction)
+
+
+def evaluate(board):
+    """Heuristic evaluation of a packed board."""
+    return c_evaluate(board)
+
+
+def expectimax(board, depth, is_max, alpha, beta,
+               tt_keys, tt_depths, tt_scores, tt_flags):
+    """Expectimax with alpha-beta at max nodes and star1 at chance nodes."""
+    return c_expectimax(board, depth, is_max, alpha, beta,
+                        tt_keys, tt_depths, tt_scores, tt_flags)
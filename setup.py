@@ -0,0 +1,14 @@
+"""Builds the optional Cython search extension.
+
+    python setup.py build_ext --inplace
+
+play_2048 picks the compiled module up automatically and falls back to
+the Numba/pure-Python search when it is absent.
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='play2048-search',
+    ext_modules=cythonize('search.pyx'),
+)